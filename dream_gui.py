@@ -1,7 +1,13 @@
 import os
+import re
 import sys
+import json
+import hashlib
 import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import queue
+from collections import deque
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
@@ -11,65 +17,320 @@ import trimesh
 from trimesh.viewer import windowed
 import numpy as np
 
+# libvips is optional; it decodes/thumbnails faster than PIL when available
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
+
+# pyrender is optional; it renders previews straight to an ndarray instead of a PNG round trip
+try:
+    import pyrender
+except ImportError:
+    pyrender = None
+
 # DreamGaussian + Voxel support imports
 import subprocess
 import shutil
 import platform
 
+from vox_utils import binvox_to_spans, mesh_to_vox, write_solid_vox
+
 # ---- CONFIG ----
-DREAMGAUSSIAN_SCRIPT = os.path.join(os.getcwd(), "run_dreamgaussian.py")
+# resolved against this file, not the working directory, so a later chdir can't redirect them
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DREAMGAUSSIAN_WORKER = os.path.join(ROOT_DIR, "dreamgaussian_worker.py")
+CONFIG_PRESETS = ("image.yaml", "image_sai.yaml", "imagedream.yaml", "text.yaml", "text_mv.yaml")
+CONFIG_PATHS = {name: os.path.join(ROOT_DIR, "configs", name) for name in CONFIG_PRESETS}
 MAGICAVOXEL_PATH = r"C:\Program Files\MagicaVoxel\MagicaVoxel.exe"  # Change if needed
+THUMBNAIL_DIR = os.path.join(ROOT_DIR, "thumbnails")  # preview renders, keyed by mesh hash
+CUDA_VOXELIZER = shutil.which("cuda_voxelizer")  # https://github.com/Forceflow/cuda_voxelizer, optional GPU voxelization
+RESULT_PREFIX = "@@DREAMGAUSSIAN_RESULT@@ "  # must match dreamgaussian_worker.RESULT_PREFIX
+LOG_MAX_LINES = 1000  # lines kept in the job log widget
 
 # ---- UTILS ----
 
 def ensure_dir(path):
-    if not os.path.exists(path):
-        os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
     return path
 
-def run_dreamgaussian(text_prompt, image_path, out_dir, mesh_name="dreamasset", hd=True, config_preset="auto"):
-    config_dir = os.path.join(os.getcwd(), "configs")
+COUNTER_FILE = ".counter"
+
+def read_counter(out_dir):
+    try:
+        with open(os.path.join(out_dir, COUNTER_FILE)) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        pass
+    # no counter yet: start past whatever is already in the folder so old assets aren't overwritten
+    try:
+        with os.scandir(out_dir) as entries:
+            return sum(1 for _ in entries)
+    except OSError:
+        return 0
+
+def write_counter(out_dir, value):
+    path = os.path.join(out_dir, COUNTER_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(value))
+    os.replace(tmp_path, path)
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+VIPS_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+def decode_thumbnail(data, size=320):
+    """Decode encoded image bytes into a PIL image no larger than size x size."""
+    if pyvips is not None:
+        v = pyvips.Image.thumbnail_buffer(data, size, height=size)
+        if v.format == "uchar" and v.bands in VIPS_MODES:
+            mode = VIPS_MODES[v.bands]
+            return Image.frombuffer(mode, (v.width, v.height), v.write_to_memory(), "raw", mode, 0, 1)
+    im = Image.open(trimesh.util.wrap_as_stream(data))
+    im.thumbnail((size, size))
+    return im
+
+def load_geometry(path):
+    # vertices/faces handed over by the worker as a temporary .npz; None if unavailable
+    if not path:
+        return None
+    try:
+        with np.load(path) as data:
+            return trimesh.Trimesh(vertices=data["vertices"], faces=data["faces"], process=False)
+    except Exception as e:
+        print(f"Could not load worker geometry {path}: {e}")
+        return None
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# tqdm progress token, e.g. " 42%|####      | 210/500"
+PROGRESS_RE = re.compile(r"(\d{1,3})%\|")
+
+def select_config(text_prompt, image_path, config_preset="auto"):
     # Live config selection
     if config_preset and config_preset != "auto":
-        config = os.path.join(config_dir, config_preset)
+        return CONFIG_PATHS[config_preset]
+    if text_prompt and image_path:
+        return CONFIG_PATHS["imagedream.yaml"]
+    elif text_prompt:
+        return CONFIG_PATHS["text.yaml"]
     else:
-        if text_prompt and image_path:
-            config = os.path.join(config_dir, "imagedream.yaml")
-        elif text_prompt:
-            config = os.path.join(config_dir, "text.yaml")
-        else:
-            config = os.path.join(config_dir, "image.yaml")
-    # Assemble command to run DreamGaussian
-    args = [
-        sys.executable, DREAMGAUSSIAN_SCRIPT,
-        "--config", config,
-        "--output_dir", out_dir,
-        "--name", mesh_name,
-        "--hd" if hd else "--low"
-    ]
-    if text_prompt:
-        args += ["--text", text_prompt]
-    if image_path:
-        args += ["--image", image_path]
-    # Run and wait
-    print("Running DreamGaussian with:", args)
-    result = subprocess.run(args, capture_output=True, text=True, encoding="utf-8")
-    print(result.stdout)
-    if result.returncode != 0:
-        print(result.stderr)
-        raise Exception("DreamGaussian failed!")
-    # Output files: out_dir/mesh_name.obj, out_dir/mesh_name.png
-    return os.path.join(out_dir, f"{mesh_name}.obj"), os.path.join(out_dir, f"{mesh_name}.png")
-
-def obj_to_vox(obj_path, vox_path, resolution):
+        return CONFIG_PATHS["image.yaml"]
+
+class DreamGaussianWorker:
+    """Long-lived DreamGaussian process; torch/CUDA are imported once and reused across jobs."""
+
+    def __init__(self, log=sys.stdout.write):
+        self.log = log
+        self.proc = None
+        self.results = None
+        # reported by the worker at startup, it has torch imported anyway
+        self.cuda = False
+        self.tail = deque(maxlen=20)
+        self.lock = threading.Lock()
+
+    def start(self):
+        args = [sys.executable, "-u", DREAMGAUSSIAN_WORKER]
+        self.log(f"Starting DreamGaussian worker: {args}\n")
+        # stderr merged so tqdm progress and tracebacks show up in the log too
+        self.proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                     text=True, encoding="utf-8", errors="replace", bufsize=1)
+        # fresh queue per process so a dead worker's sentinel can't leak into the next one
+        self.results = queue.Queue()
+        reader = threading.Thread(target=self.pump, args=(self.proc, self.results), daemon=True)
+        reader.start()
+
+    def pump(self, proc, results):
+        try:
+            for line in proc.stdout:
+                # stderr is merged in, so an unterminated write (an open tqdm bar) can end up glued in front
+                at = line.find(RESULT_PREFIX)
+                if at >= 0:
+                    try:
+                        result = json.loads(line[at + len(RESULT_PREFIX):])
+                    except ValueError as e:
+                        # still answer the job, otherwise run() waits for a result that never comes
+                        result = {"error": f"unreadable worker result: {e}"}
+                    if "ready" in result:
+                        # startup announcement, always ahead of any job result
+                        self.cuda = bool(result.get("cuda"))
+                    else:
+                        results.put(result)
+                    line = line[:at]
+                    if not line:
+                        continue
+                    line += "\n"
+                elif line == "\n":
+                    # the worker opens every result with a newline; don't log it as a blank line
+                    continue
+                self.tail.append(line)
+                try:
+                    self.log(line)
+                except Exception:
+                    # keep draining without a log sink, or the worker blocks on a full stdout pipe
+                    pass
+        finally:
+            proc.stdout.close()
+            # worker died (or this reader did): unblock whoever is waiting on a result
+            results.put(None)
+
+    def run(self, text_prompt, image_path, out_dir, mesh_name="dreamasset", hd=True, config_preset="auto"):
+        job = {
+            "config": select_config(text_prompt, image_path, config_preset),
+            "out_dir": out_dir,
+            "mesh_name": mesh_name,
+            "hd": hd,
+            "text": text_prompt,
+            "image": image_path,
+        }
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self.start()
+            self.tail.clear()
+            self.log(f"Running DreamGaussian job: {job}\n")
+            self.proc.stdin.write(json.dumps(job) + "\n")
+            self.proc.stdin.flush()
+            result = self.results.get()
+        if result is None:
+            raise Exception("DreamGaussian worker exited!\n" + "".join(self.tail))
+        if "error" in result:
+            raise Exception(f"DreamGaussian failed: {result['error']}\n" + "".join(self.tail))
+        return result["obj_path"], result["tex_path"], load_geometry(result.get("geometry_path"))
+
+    def close(self):
+        if self.proc is None or self.proc.poll() is not None:
+            return
+        self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+def obj_to_vox_obj2vox(obj_path, vox_path, resolution):
     try:
         from obj2vox import obj2vox
     except ImportError:
         raise Exception("You must install 'obj2vox' package (pip install obj2vox)!")
-    print(f"Converting {obj_path} to {vox_path} at resolution {resolution}...")
+    print(f"Converting {obj_path} to {vox_path} at resolution {resolution} (obj2vox)...")
     obj2vox(obj_path, vox_path, grid=resolution)
     return vox_path
 
+def obj_to_vox_cuda(obj_path, vox_path, resolution, adaptive=True):
+    print(f"Converting {obj_path} to {vox_path} at resolution {resolution} (cuda_voxelizer)...")
+    # binvox rather than its own .vox output, so orientation and padding go through write_solid_vox like the CPU path
+    result = subprocess.run([CUDA_VOXELIZER, "-f", obj_path, "-s", str(resolution), "-o", "binvox", "-solid"], capture_output=True, text=True)
+    # cuda_voxelizer writes <input file name>_<grid size>.binvox next to the input
+    out_path = f"{obj_path}_{resolution}.binvox"
+    if result.returncode != 0 or not os.path.exists(out_path):
+        raise Exception(f"cuda_voxelizer failed: {result.stderr or result.stdout}")
+    if "falling back to cpu" in (result.stdout + result.stderr).lower():
+        # without a GPU cuda_voxelizer quietly runs its own CPU voxelizer, slower than the Embree path
+        os.remove(out_path)
+        raise Exception("cuda_voxelizer found no CUDA GPU")
+    # already solid; binvox's own runs become spans without decoding the dense grid
+    with open(out_path, "rb") as f:
+        spans, shape = binvox_to_spans(f)
+    os.remove(out_path)
+    if len(spans):
+        # cuda_voxelizer fits the mesh into a resolution^3 cube, crop to the occupied cells like the CPU grid
+        spans = spans.astype(np.int64)
+        lo = spans[:, :3].min(axis=0)
+        shape = (spans[:, 0].max() + 1 - lo[0], spans[:, 3].max() - lo[2], spans[:, 1].max() + 1 - lo[1])
+        spans -= np.concatenate([lo, lo[2:]])
+    return write_solid_vox(vox_path, spans, shape, resolution, adaptive=adaptive)
+
+def obj_to_vox(obj_path, vox_path, resolution, mesh=None, adaptive=True, cuda=True):
+    # cuda: whether a CUDA device is usable (see DreamGaussianWorker.cuda)
+    if os.environ.get("DREAMGAUSSIAN_USE_OBJ2VOX"):
+        return obj_to_vox_obj2vox(obj_path, vox_path, resolution)
+    if CUDA_VOXELIZER and cuda:
+        # any cuda_voxelizer failure, including its own CPU fallback, falls through to the Embree path
+        try:
+            return obj_to_vox_cuda(obj_path, vox_path, resolution, adaptive=adaptive)
+        except Exception as e:
+            print(f"{e}\nFalling back to CPU voxelization.")
+    if mesh is None:
+        mesh = trimesh.load(obj_path, force="mesh")
+    print(f"Converting {obj_path} to {vox_path} at resolution {resolution}...")
+    return mesh_to_vox(mesh, vox_path, resolution, adaptive=adaptive)
+
+def load_preview_mesh(mesh_path):
+    # a 320px thumbnail needs neither the cleanup pass (merge/winding/adjacency) nor materials
+    return trimesh.load_mesh(mesh_path, process=False, skip_materials=True, force="mesh")
+
+# one offscreen renderer (and GL context) per preview process, keyed by size
+_offscreen_renderers = {}
+PREVIEW_FOV = 45  # degrees, both axes of the square preview
+
+def render_mesh_pyrender(mesh, size=320):
+    """Render mesh with pyrender into an RGBA ndarray, framed by trimesh's default scene camera."""
+    renderer = _offscreen_renderers.get(size)
+    if renderer is None:
+        renderer = _offscreen_renderers[size] = pyrender.OffscreenRenderer(size, size)
+    tscene = mesh.scene()
+    # the default camera is fitted for a 60x45 degree frustum; refit it for the square one rendered here
+    tscene.set_camera(resolution=(size, size), fov=(PREVIEW_FOV, PREVIEW_FOV))
+    scene = pyrender.Scene(bg_color=[1.0, 1.0, 1.0, 0.0], ambient_light=[0.3, 0.3, 0.3])
+    scene.add(pyrender.Mesh.from_trimesh(mesh, smooth=False))
+    camera = pyrender.PerspectiveCamera(yfov=np.radians(PREVIEW_FOV), aspectRatio=1.0)
+    scene.add(camera, pose=tscene.camera_transform)
+    scene.add(pyrender.DirectionalLight(intensity=3.0), pose=tscene.camera_transform)
+    color, _ = renderer.render(scene, flags=pyrender.RenderFlags.RGBA)
+    return color
+
+def render_mesh_preview(mesh_path, size=320, mesh=None):
+    """Render (or fetch from the thumbnail cache) a size x size preview of mesh_path as a PIL image, None if rendering is unavailable.
+
+    Top-level so it can run in the preview process pool, where each process has its own GL context.
+    An already loaded mesh can be passed to skip re-parsing mesh_path.
+    """
+    cached = os.path.join(ensure_dir(THUMBNAIL_DIR), file_digest(mesh_path) + ".png")
+    try:
+        with open(cached, "rb") as f:
+            return decode_thumbnail(f.read(), size)
+    except FileNotFoundError:
+        pass
+    if mesh is None:
+        mesh = load_preview_mesh(mesh_path)
+    if pyrender is not None:
+        # pixels go straight from the framebuffer to PIL; PNG is only encoded for the disk cache
+        im = Image.fromarray(render_mesh_pyrender(mesh, size))
+        im.save(cached)
+        return im
+    img = mesh.scene().save_image(resolution=[size, size])
+    if not img:
+        return None
+    with open(cached, "wb") as f:
+        f.write(img)
+    return decode_thumbnail(img, size)
+
+def render_image_preview(image_path, size=160):
+    """Downscaled, disk-cached preview of a prompt image as a PIL image."""
+    cached = os.path.join(ensure_dir(THUMBNAIL_DIR), f"{file_digest(image_path)}_{size}.png")
+    try:
+        im = Image.open(cached)
+        im.load()
+        return im
+    except FileNotFoundError:
+        pass
+    im = Image.open(image_path)
+    # JPEG only: let libjpeg decode at a reduced DCT scale instead of full resolution
+    im.draft("RGB", (size * 2, size * 2))
+    im.thumbnail((size, size), Image.LANCZOS)
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA")
+    im.save(cached)
+    return im
+
 def show_mesh_in_window(mesh_path):
     mesh = trimesh.load(mesh_path)
     windowed.SceneViewer(mesh)
@@ -83,6 +344,17 @@ class AssetGeneratorApp(tk.Tk):
         self.geometry("1080x1080")
         self.resizable(True, True)
         self.jobs = queue.Queue()
+        self.log_queue = queue.Queue()
+        # message boxes requested from job threads, shown on the Tk thread
+        self.notices = queue.Queue()
+        # (label, render fn, path) -> preview worker thread -> (label, PIL image, error) for the Tk thread
+        self.preview_requests = queue.Queue()
+        self.preview_results = queue.Queue()
+        threading.Thread(target=self.preview_worker, daemon=True).start()
+        # mesh previews rasterize in separate processes: no GIL contention, no shared GL context;
+        # spawned rather than forked, since forking a threaded Tk process can inherit held locks and GL state
+        self.preview_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                                mp_context=multiprocessing.get_context("spawn"))
         self.preview_mesh_path = None
 
         # --- Variables ---
@@ -90,11 +362,18 @@ class AssetGeneratorApp(tk.Tk):
         self.image_path = tk.StringVar()
         self.voxel_mode = tk.BooleanVar(value=True)
         self.voxel_res = tk.IntVar(value=256)
+        self.voxel_adaptive = tk.BooleanVar(value=True)
+        self.hd_mode = tk.BooleanVar(value=True)
         self.mesh_only = tk.BooleanVar(value=True)
         self.texture_only = tk.BooleanVar(value=False)
         self.mesh_and_texture = tk.BooleanVar(value=True)
         self.output_dir = tk.StringVar(value=os.getcwd())
+        self.asset_counter = read_counter(self.output_dir.get())
+        self.output_dir.trace_add("write", self.on_output_dir_changed)
         self.processing = False
+        # DreamGaussian runs in one persistent subprocess for the app lifetime
+        self.worker = DreamGaussianWorker(log=lambda line: self.post(self.log_queue, line, "<<LogLine>>"))
+        self.worker.start()
 
         # --- UI ---
         self.setup_ui()
@@ -129,6 +408,9 @@ class AssetGeneratorApp(tk.Tk):
         self.image_entry.grid(row=1, column=1, sticky="ew", padx=4, pady=2)
         browse_img_btn = ttk.Button(input_frame, text="Browse...", command=self.browse_image)
         browse_img_btn.grid(row=1, column=2, sticky="ew", padx=2, pady=2)
+        self.image_preview_label = ttk.Label(input_frame)
+        self.image_preview_label.grid(row=2, column=1, sticky="w", padx=4, pady=2)
+        self.image_path.trace_add("write", self.on_image_path_changed)
 
         # --- Options Frame ---
         options_frame = ttk.LabelFrame(controls_frame, text="Options", padding=10)
@@ -150,9 +432,11 @@ class AssetGeneratorApp(tk.Tk):
         # --- Config Selection ---
         ttk.Label(options_frame, text="Config Preset:").grid(row=6, column=0, sticky="w")
         self.config_preset = tk.StringVar(value="auto")
-        config_options = ["auto", "image.yaml", "image_sai.yaml", "imagedream.yaml", "text.yaml", "text_mv.yaml"]
+        config_options = ["auto", *CONFIG_PRESETS]
         self.config_menu = ttk.Combobox(options_frame, textvariable=self.config_preset, values=config_options, state="readonly")
         self.config_menu.grid(row=6, column=1, sticky="ew")
+        ttk.Checkbutton(options_frame, text="Adaptive voxel grid (fit to mesh bounds)", variable=self.voxel_adaptive).grid(row=7, column=0, columnspan=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="HD quality (off = fast draft)", variable=self.hd_mode).grid(row=8, column=0, columnspan=2, sticky="w")
 
         # --- Control Frame ---
         control_frame = ttk.LabelFrame(controls_frame, text="Control", padding=10)
@@ -176,9 +460,19 @@ class AssetGeneratorApp(tk.Tk):
         job_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10, pady=(0,10))
         job_frame.grid_columnconfigure(0, weight=1)
         self.job_list = tk.Listbox(job_frame, height=1)
-        self.job_list.grid(row=0, column=0, sticky="ew")
-
-        self.after(200, self.poll_queue)
+        self.job_list.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.progress = ttk.Progressbar(job_frame, maximum=100)
+        self.progress.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(6, 0))
+        self.log_text = tk.Text(job_frame, height=8, state="disabled", wrap="none")
+        self.log_text.grid(row=2, column=0, sticky="ew", pady=(6, 0))
+        log_scroll = ttk.Scrollbar(job_frame, orient="vertical", command=self.log_text.yview)
+        log_scroll.grid(row=2, column=1, sticky="ns", pady=(6, 0))
+        self.log_text.config(yscrollcommand=log_scroll.set)
+
+        # worker threads hand results over through queues and wake Tk with virtual events; no polling
+        self.bind("<<LogLine>>", lambda event: self.drain_log())
+        self.bind("<<PreviewReady>>", lambda event: self.drain_previews())
+        self.bind("<<JobDone>>", self.on_job_done)
 
     def browse_image(self):
         img_path = filedialog.askopenfilename(title="Select image file", filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp")])
@@ -190,24 +484,61 @@ class AssetGeneratorApp(tk.Tk):
         if folder:
             self.output_dir.set(folder)
 
+    def on_output_dir_changed(self, *args):
+        self.asset_counter = read_counter(self.output_dir.get())
+
     def enqueue_job(self):
         text = self.text_prompt.get().strip()
         img = self.image_path.get().strip()
         if not text and not img:
             messagebox.showwarning("No prompt", "Provide text and/or image prompt.")
             return
-        out_dir = self.output_dir.get()
-        mesh_name = f"dreamasset_{len(os.listdir(out_dir))}"
-        job = (text, img, out_dir, mesh_name, self.mesh_only.get(), self.texture_only.get(), self.mesh_and_texture.get(), self.voxel_mode.get(), self.voxel_res.get())
+        out_dir = ensure_dir(self.output_dir.get())
+        self.asset_counter += 1
+        write_counter(out_dir, self.asset_counter)
+        mesh_name = f"dreamasset_{self.asset_counter}"
+        job = (text, img, out_dir, mesh_name, self.mesh_only.get(), self.texture_only.get(), self.mesh_and_texture.get(), self.voxel_mode.get(), self.voxel_res.get(), self.voxel_adaptive.get(), self.hd_mode.get())
         self.jobs.put(job)
         self.job_list.insert(tk.END, f"Job {self.job_list.size()+1}: {mesh_name}")
         if not self.processing:
             self.process_next_job()
 
-    def poll_queue(self):
-        if not self.processing and not self.jobs.empty():
+    def post(self, q, item, event):
+        # callable from any thread
+        q.put(item)
+        self.wake(event)
+
+    def wake(self, event):
+        try:
+            self.event_generate(event, when="tail")
+        except (tk.TclError, RuntimeError):
+            # window closed, or mainloop not running yet: the queue is drained on the next event
+            pass
+
+    def on_job_done(self, event=None):
+        if not self.processing:
             self.process_next_job()
-        self.after(200, self.poll_queue)
+        self.drain_notices()
+
+    def drain_log(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
+        for line in lines:
+            m = PROGRESS_RE.search(line)
+            if m:
+                self.progress["value"] = int(m.group(1))
+        self.log_text.config(state="normal")
+        self.log_text.insert(tk.END, "".join(lines))
+        # long jobs print thousands of progress lines; keep only the tail so the widget stays small
+        self.log_text.delete("1.0", f"end-{LOG_MAX_LINES}l")
+        self.log_text.see(tk.END)
+        self.log_text.config(state="disabled")
 
     def process_next_job(self):
         if self.jobs.empty():
@@ -215,46 +546,91 @@ class AssetGeneratorApp(tk.Tk):
         self.processing = True
         job = self.jobs.get()
         self.job_list.delete(0)
+        self.progress["value"] = 0
         t = threading.Thread(target=self.run_job, args=job)
         t.daemon = True
         t.start()
 
-    def run_job(self, text, img, out_dir, mesh_name, mesh_only, texture_only, mesh_and_texture, voxel_mode, voxel_res):
+    def run_job(self, text, img, out_dir, mesh_name, mesh_only, texture_only, mesh_and_texture, voxel_mode, voxel_res, voxel_adaptive=True, hd=True):
         try:
             # Run DreamGaussian pipeline
             config_preset = self.config_preset.get() if hasattr(self, 'config_preset') else "auto"
-            obj_path, tex_path = run_dreamgaussian(text, img, out_dir, mesh_name, hd=True, config_preset=config_preset)
+            obj_path, tex_path, mesh = self.worker.run(text, img, out_dir, mesh_name, hd=hd, config_preset=config_preset)
             out_paths = [obj_path]
+            # one mesh feeds both voxelizer and preview: the worker's geometry, else a single OBJ parse
+            if mesh is None:
+                mesh = load_preview_mesh(obj_path)
             if texture_only or mesh_and_texture:
                 out_paths.append(tex_path)
             # If voxel mode: convert to .vox
             vox_path = None
             if voxel_mode:
                 vox_path = os.path.join(out_dir, f"{mesh_name}_{voxel_res}.vox")
-                obj_to_vox(obj_path, vox_path, voxel_res)
+                obj_to_vox(obj_path, vox_path, voxel_res, mesh=mesh, adaptive=voxel_adaptive, cuda=self.worker.cuda)
                 out_paths.append(vox_path)
             # Preview OBJ (show progress!)
             self.preview_mesh_path = obj_path
-            self.show_preview(obj_path)
-            messagebox.showinfo("Success", f"Generation complete!\nFiles:\n" + "\n".join(out_paths))
+            self.show_preview(obj_path, mesh=mesh)
+            self.notices.put((messagebox.showinfo, "Success", f"Generation complete!\nFiles:\n" + "\n".join(out_paths)))
         except Exception as ex:
-            messagebox.showerror("Error", f"Job failed: {ex}")
+            self.notices.put((messagebox.showerror, "Error", f"Job failed: {ex}"))
         finally:
             self.processing = False
+            self.wake("<<JobDone>>")
 
-    def show_preview(self, mesh_path):
+    def show_preview(self, mesh_path, mesh=None):
+        # safe from any thread: rendering happens in the preview pool, display on <<PreviewReady>>
+        future = self.preview_pool.submit(render_mesh_preview, mesh_path, 320, mesh)
+        future.add_done_callback(self.on_mesh_preview_done)
+
+    def on_mesh_preview_done(self, future):
+        # runs on the pool's callback thread; the image is already decoded, Tk only builds the PhotoImage
         try:
-            mesh = trimesh.load(mesh_path)
-            scene = mesh.scene()
-            img = scene.save_image(resolution=[320, 320])
-            if img:
-                photo = ImageTk.PhotoImage(Image.open(trimesh.util.wrap_as_stream(img)))
-                self.preview_label.config(image=photo)
-                self.preview_label.image = photo
-            else:
-                self.preview_label.config(text="3D preview not available.")
+            result = (self.preview_label, future.result(), None)
         except Exception as e:
-            self.preview_label.config(text=f"Preview error: {e}")
+            result = (self.preview_label, None, e)
+        self.post(self.preview_results, result, "<<PreviewReady>>")
+
+    def on_image_path_changed(self, *args):
+        path = self.image_path.get().strip()
+        if os.path.isfile(path):
+            self.preview_requests.put((self.image_preview_label, render_image_preview, path))
+        else:
+            self.image_preview_label.config(image="", text="")
+            self.image_preview_label.image = None
+
+    def preview_worker(self):
+        while True:
+            label, render, path = self.preview_requests.get()
+            try:
+                result = (label, render(path), None)
+            except Exception as e:
+                result = (label, None, e)
+            self.post(self.preview_results, result, "<<PreviewReady>>")
+
+    def drain_previews(self):
+        while True:
+            try:
+                label, image, error = self.preview_results.get_nowait()
+            except queue.Empty:
+                break
+            if error is not None:
+                label.config(image="", text=f"Preview error: {error}")
+            elif image is not None:
+                # PhotoImage must be created on the Tk thread
+                photo = ImageTk.PhotoImage(image)
+                label.config(image=photo)
+                label.image = photo
+            else:
+                label.config(image="", text="3D preview not available.")
+
+    def drain_notices(self):
+        while True:
+            try:
+                show, title, message = self.notices.get_nowait()
+            except queue.Empty:
+                break
+            show(title, message)
 
     def open_preview_window(self):
         if not self.preview_mesh_path:
@@ -263,6 +639,8 @@ class AssetGeneratorApp(tk.Tk):
         show_mesh_in_window(self.preview_mesh_path)
 
     def on_close(self):
+        self.worker.close()
+        self.preview_pool.shutdown(wait=False)
         self.destroy()
 
 # ---- RUN ----
@@ -0,0 +1,81 @@
+import os
+os.environ["PYTHONIOENCODING"] = "utf-8"  # Ensure UTF-8 output for Windows console
+
+import sys
+import json
+import tempfile
+import traceback
+
+import numpy as np
+import torch
+from omegaconf import OmegaConf
+
+# heavy imports (torch, CUDA context, renderer) happen once here, not per job
+from run_dreamgaussian import GUI
+
+# marks protocol lines on stdout; everything else is treated as log output
+RESULT_PREFIX = "@@DREAMGAUSSIAN_RESULT@@ "
+
+# guidance models survive across jobs so their weights are only loaded once
+_guidance_sd = {}
+_guidance_zero123 = {}
+
+
+def run(job):
+    opt = OmegaConf.load(job["config"])
+    opt.outdir = job["out_dir"]
+    opt.save_path = job["mesh_name"]
+    if not job.get("hd", True):
+        # draft mode: half the stage 1 training iterations for a quick look
+        opt.iters = max(1, opt.iters // 2)
+    if job.get("text"):
+        opt.prompt = job["text"]
+    if job.get("image"):
+        opt.input = job["image"]
+
+    sd_key = (bool(opt.mvdream), bool(opt.imagedream))
+    zero123_key = bool(opt.stable_zero123)
+
+    gui = GUI(opt)
+    gui.guidance_sd = _guidance_sd.get(sd_key)
+    gui.guidance_zero123 = _guidance_zero123.get(zero123_key)
+    mesh = gui.train(opt.iters)
+    if gui.guidance_sd is not None:
+        _guidance_sd[sd_key] = gui.guidance_sd
+    if gui.guidance_zero123 is not None:
+        _guidance_zero123[zero123_key] = gui.guidance_zero123
+
+    # see GUI.save_model / Mesh.write_obj for the naming
+    obj_path = os.path.join(opt.outdir, opt.save_path + "_mesh." + opt.mesh_format)
+    tex_path = os.path.join(opt.outdir, opt.save_path + "_mesh_albedo.png")
+
+    # hand the raw geometry back too, so the GUI can voxelize without re-parsing the OBJ
+    fd, geometry_path = tempfile.mkstemp(prefix=opt.save_path + "_", suffix=".npz")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, vertices=mesh.v.detach().cpu().numpy(), faces=mesh.f.detach().cpu().numpy())
+    return {"obj_path": obj_path, "tex_path": tex_path, "geometry_path": geometry_path}
+
+
+def respond(result):
+    # start on a fresh line: stderr shares the pipe and may have left a line unterminated
+    sys.stderr.flush()
+    print("\n" + RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+def main():
+    # announce once, so the GUI can skip GPU-only tools (cuda_voxelizer) on machines without CUDA
+    respond({"ready": True, "cuda": torch.cuda.is_available()})
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            result = run(json.loads(line))
+        except Exception as e:
+            traceback.print_exc()
+            result = {"error": f"{type(e).__name__}: {e}"}
+        respond(result)
+
+
+if __name__ == "__main__":
+    main()
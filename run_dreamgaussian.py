@@ -415,6 +415,7 @@ class GUI:
         if not hasattr(self.opt, "save_path") or self.opt.save_path is None:
             self.opt.save_path = getattr(self.opt, "name", "dreamasset")
         os.makedirs(self.opt.outdir, exist_ok=True)
+        mesh = None
         if mode == 'geo':
             path = os.path.join(self.opt.outdir, self.opt.save_path + '_mesh.ply')
             mesh = self.renderer.gaussians.extract_mesh(path, self.opt.density_thresh)
@@ -553,6 +554,7 @@ class GUI:
             self.renderer.gaussians.save_ply(path)
 
         print(f"[INFO] save model to {path}.")
+        return mesh
 
     def register_dpg(self):
         ### register texture
@@ -909,7 +911,7 @@ class GUI:
             self.renderer.gaussians.prune(min_opacity=0.01, extent=1, max_screen_size=1)
         # save
         self.save_model(mode='model')
-        self.save_model(mode='geo+tex')
+        return self.save_model(mode='geo+tex')
         
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+import io
+import os
+import sys
+import struct
+import tracemalloc
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vox_utils import (MAX_MODEL_SIZE, binvox_to_spans, fill_solid, mesh_to_vox, spans_yup_to_zup, voxelize_surface,
+                       write_vox, write_vox_spans)
+
+
+def read_vox(path):
+    # returns the model sizes, the XYZI voxels per model and the scene graph chunk ids
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:4] == b"VOX "
+    assert data[8:12] == b"MAIN"
+    content, children = struct.unpack("<ii", data[12:20])
+    assert content == 0 and 20 + children == len(data)
+
+    sizes, models, nodes = [], [], []
+    i = 20
+    while i < len(data):
+        chunk_id = data[i:i + 4]
+        content, children = struct.unpack("<ii", data[i + 4:i + 12])
+        body = data[i + 12:i + 12 + content]
+        if chunk_id == b"SIZE":
+            sizes.append(struct.unpack("<iii", body))
+        elif chunk_id == b"XYZI":
+            count = struct.unpack("<i", body[:4])[0]
+            assert len(body) == 4 + 4 * count
+            models.append(np.frombuffer(body[4:], dtype=np.uint8).reshape(-1, 4))
+        else:
+            nodes.append(chunk_id)
+        i += 12 + content + children
+    assert i == len(data)
+    return sizes, models, nodes
+
+
+def solid_sphere(resolution):
+    mesh = trimesh.creation.icosphere(subdivisions=4)
+    vg = mesh.voxelized(pitch=mesh.extents.max() / (resolution - 1), method="ray")
+    return mesh, vg
+
+
+def test_fill_solid_spans_are_compact():
+    mesh, vg = solid_sphere(256)
+    tracemalloc.start()
+    try:
+        spans = fill_solid(mesh, vg)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert spans.dtype == np.uint16 and spans.shape[1] == 4
+    # ~2 surface runs per column at most, nowhere near one row per filled cell
+    assert len(spans) < 4 * vg.shape[0] * vg.shape[2]
+    # a dense uint8 grid alone would be 16 MB, the old per-cell fill peaked well above 1 GB
+    assert peak < 128 * 1024 ** 2
+
+    filled = int((spans[:, 3].astype(np.int64) - spans[:, 2]).sum())
+    assert abs(filled - mesh.volume / vg.pitch[0] ** 3) / filled < 0.05
+
+
+def binvox_bytes(dense):
+    # dense: (X, Y, Z) bool -> binvox with voxels stored x, z, y (y fastest), runs capped at 255
+    raw = np.asarray(dense, dtype=np.uint8).transpose(0, 2, 1).ravel()
+    rle = bytearray()
+    i = 0
+    while i < len(raw):
+        j = i
+        while j < len(raw) and j - i < 255 and raw[j] == raw[i]:
+            j += 1
+        rle += bytes([raw[i], j - i])
+        i = j
+    header = "#binvox 1\ndim {} {} {}\ntranslate 0 0 0\nscale 1\ndata\n".format(*dense.shape)
+    return header.encode() + bytes(rle)
+
+
+@pytest.mark.parametrize("shape", [(6, 6, 6), (5, 7, 6), (3, 300, 4)])
+def test_binvox_to_spans(shape):
+    dense = np.random.default_rng(0).random(shape) < 0.4
+    # long runs over the 255 cap and across column ends
+    dense[1:, :, 1:] = True
+    dense[0, :, 0] = False
+    spans, grid_shape = binvox_to_spans(io.BytesIO(binvox_bytes(dense)))
+
+    assert grid_shape == shape and spans.dtype == np.uint16
+    rebuilt = np.zeros(shape, dtype=bool)
+    for x, z, y0, y1 in spans.astype(np.int64):
+        assert y1 > y0
+        rebuilt[x, y0:y1, z] = True
+    assert (rebuilt == dense).all()
+    # maximal runs only: no two spans of a column touch
+    assert len(spans) == int((np.diff(np.pad(dense, ((0, 0), (1, 0), (0, 0))).astype(np.int8), axis=1) == 1).sum())
+
+
+def test_binvox_to_spans_matches_trimesh():
+    dense = np.random.default_rng(1).random((8, 8, 8)) < 0.5
+    data = binvox_bytes(dense)
+    # trimesh decodes the same file densely, as a reference for the axis order
+    reference = trimesh.exchange.binvox.load_binvox(io.BytesIO(data), axis_order="xzy").encoding.dense
+    spans, shape = binvox_to_spans(io.BytesIO(data))
+
+    rebuilt = np.zeros(shape, dtype=bool)
+    for x, z, y0, y1 in spans.astype(np.int64):
+        rebuilt[x, y0:y1, z] = True
+    assert (rebuilt == reference).all()
+
+
+def test_write_vox_spans_tiles_and_counts(tmp_path):
+    mesh, vg = solid_sphere(300)
+    spans, shape = spans_yup_to_zup(fill_solid(mesh, vg), vg.shape)
+    path = str(tmp_path / "sphere.vox")
+    write_vox_spans(path, spans, shape)
+
+    sizes, models, nodes = read_vox(path)
+    # 299 cells per axis -> 2 x 2 x 2 tiles; the sphere only reaches the first tile and its 3 face neighbours
+    assert len(sizes) == len(models) == 4
+    assert all(max(size) <= MAX_MODEL_SIZE for size in sizes)
+    assert nodes.count(b"nSHP") == 4 and nodes.count(b"nGRP") == 1
+    filled = int((spans[:, 3].astype(np.int64) - spans[:, 2]).sum())
+    assert sum(len(voxels) for voxels in models) == filled
+    for size, voxels in zip(sizes, models):
+        assert (voxels[:, :3] < np.asarray(size)).all()
+
+
+def test_write_vox_indices(tmp_path):
+    indices = np.array([[0, 0, 0], [1, 2, 3], [3, 3, 3]])
+    path = str(tmp_path / "cells.vox")
+    write_vox(path, indices, (4, 4, 4), color_index=7)
+
+    sizes, models, nodes = read_vox(path)
+    assert sizes == [(4, 4, 4)] and not nodes
+    assert sorted(map(tuple, models[0].tolist())) == [(0, 0, 0, 7), (1, 2, 3, 7), (3, 3, 3, 7)]
+
+
+def test_write_vox_empty(tmp_path):
+    path = str(tmp_path / "empty.vox")
+    write_vox(path, np.zeros((0, 3), dtype=np.int64), (8, 8, 8))
+
+    sizes, models, _ = read_vox(path)
+    assert sizes == [(1, 1, 1)] and len(models[0]) == 0
+
+
+def test_voxelize_surface_fits_resolution():
+    # the ray lattice used to give a unit box (127, 127, 129) at 128
+    vg, _ = voxelize_surface(trimesh.creation.box(), 128)
+    assert tuple(int(n) for n in vg.shape) == (127, 127, 127)
+
+
+def test_voxelize_surface_thin_mesh():
+    # thinner than one pitch: the ray voxelizer finds no hits and raises
+    mesh = trimesh.creation.box((1, 0.001, 1))
+    vg, _ = voxelize_surface(mesh, 256)
+    assert vg.shape[1] == 1 and max(vg.shape) <= 256
+    assert len(fill_solid(mesh, vg))
+
+
+@pytest.mark.parametrize("adaptive", [True, False])
+def test_mesh_to_vox_adaptive(tmp_path, adaptive):
+    # Y-up 2 x 1 x 0.5 box -> Z-up, tight or centered in a resolution^3 cube
+    mesh = trimesh.creation.box((2.0, 1.0, 0.5))
+    path = str(tmp_path / "box.vox")
+    mesh_to_vox(mesh, path, 64, adaptive=adaptive)
+
+    sizes, models, _ = read_vox(path)
+    assert len(sizes) == 1
+    size = np.asarray(sizes[0])
+    voxels = models[0][:, :3].astype(np.int64)
+    extent = voxels.max(axis=0) + 1 - voxels.min(axis=0)
+    # x stays x, the thin z becomes y, and the up axis y becomes z
+    assert extent[0] > extent[2] > extent[1]
+    if adaptive:
+        assert (size == extent).all() and (voxels.min(axis=0) == 0).all()
+    else:
+        assert (size == 64).all()
+        # centered: equal margins on both sides, up to one cell of rounding
+        margin = voxels.min(axis=0) - (size - 1 - voxels.max(axis=0))
+        assert (np.abs(margin) <= 1).all()
@@ -0,0 +1,292 @@
+import struct
+import numpy as np
+
+# MagicaVoxel .vox writer
+# format reference: https://github.com/ephtracy/voxel-model/blob/master/MagicaVoxel-file-format-vox.txt
+
+VOX_VERSION = 150
+MAX_MODEL_SIZE = 256  # MagicaVoxel models are at most 256^3, larger grids are split into tiles
+# cells expanded per XYZI write, bounds the writer's memory independently of the model size
+WRITE_BATCH = 1 << 18
+# rays cast per ray tracer call in fill_solid (one slab of columns)
+RAY_BATCH = 1 << 16
+MAX_PITCH_STEPS = 8  # pitch refinements before giving up on fitting the grid
+
+
+def _chunk(chunk_id, content=b"", children=b""):
+    return chunk_id + struct.pack("<ii", len(content), len(children)) + content + children
+
+
+def _string(s):
+    s = s.encode("utf-8")
+    return struct.pack("<i", len(s)) + s
+
+
+def _dict(d):
+    return struct.pack("<i", len(d)) + b"".join(_string(k) + _string(v) for k, v in d.items())
+
+
+def _transform(node_id, child_id, layer_id, translation=None):
+    frame = {"_t": " ".join(str(int(t)) for t in translation)} if translation is not None else {}
+    content = struct.pack("<i", node_id) + _dict({}) + struct.pack("<iiii", child_id, -1, layer_id, 1) + _dict(frame)
+    return _chunk(b"nTRN", content)
+
+
+def _write_model(f, spans, size, color_index):
+    # spans: [K, 4] (x, y, z_start, z_stop) local to the model, all < 256
+    lengths = spans[:, 3].astype(np.int64) - spans[:, 2]
+    ends = np.cumsum(lengths)
+    count = int(ends[-1]) if len(ends) else 0
+    f.write(_chunk(b"SIZE", struct.pack("<iii", *size)))
+    # the XYZI header goes out first, the payload follows batch by batch
+    f.write(b"XYZI" + struct.pack("<ii", 4 + 4 * count, 0) + struct.pack("<i", count))
+    # split the span list so each batch expands to about WRITE_BATCH cells
+    cuts = np.searchsorted(ends, np.arange(WRITE_BATCH, count, WRITE_BATCH), side="right")
+    for batch, batch_lengths in zip(np.split(spans, cuts), np.split(lengths, cuts)):
+        n = int(batch_lengths.sum())
+        if n == 0:
+            continue
+        # XYZI payload as one (n, 4) uint8 array -> a single tobytes() instead of a pack() per voxel
+        span = np.repeat(np.arange(len(batch)), batch_lengths)
+        offset = np.arange(n) - np.repeat(np.cumsum(batch_lengths) - batch_lengths, batch_lengths)
+        voxels = np.empty((n, 4), dtype=np.uint8)
+        voxels[:, 0] = batch[span, 0]
+        voxels[:, 1] = batch[span, 1]
+        voxels[:, 2] = batch[span, 2] + offset
+        voxels[:, 3] = color_index
+        f.write(voxels.tobytes())
+
+
+def _merge_spans(columns, starts, stops):
+    # merge overlapping/adjacent [start, stop) runs that share a column key
+    columns = np.asarray(columns, dtype=np.int64)
+    if len(columns) == 0:
+        return columns, np.asarray(starts, dtype=np.int64), np.asarray(stops, dtype=np.int64)
+    # shifting by column * stride makes a single global running max stay within each column
+    stride = int(max(np.max(stops), 1)) + 1
+    lo = columns * stride + starts
+    hi = columns * stride + stops
+    order = np.argsort(lo, kind="stable")
+    lo, hi = lo[order], hi[order]
+    reach = np.maximum.accumulate(hi)
+    first = np.concatenate([[True], lo[1:] > reach[:-1]])
+    last = np.concatenate([first[1:], [True]])
+    lo, hi = lo[first], reach[last]
+    return lo // stride, lo % stride, hi - (lo // stride) * stride
+
+
+def _ray_runs(mesh, vg, x_start, x_stop):
+    # filled runs of the (x, z) columns with x_start <= x < x_stop, from +y ray entry/exit pairs
+    shape = vg.shape
+    ix, iz = np.meshgrid(np.arange(x_start, x_stop), np.arange(shape[2]), indexing="ij")
+    origins = vg.indices_to_points(np.stack([ix.ravel(), np.full(ix.size, -1), iz.ravel()], axis=-1))
+    directions = np.tile([0.0, 1.0, 0.0], (len(origins), 1))
+    locations, index_ray, _ = mesh.ray.intersects_location(origins, directions, multiple_hits=True)
+    if not len(locations):
+        return np.zeros((3, 0), dtype=np.int64)
+
+    y = vg.points_to_indices(locations)[:, 1].astype(np.int64)
+    # drop duplicate hits reported on shared edges/vertices, they would flip the parity
+    depth = np.round((locations[:, 1] - origins[index_ray, 1]) / vg.pitch[1] * 1e3).astype(np.int64)
+    _, keep = np.unique(np.stack([index_ray, depth], axis=-1), axis=0, return_index=True)
+    index_ray, depth, y = index_ray[keep], depth[keep], y[keep]
+
+    # sort hits by ray then depth, and pair them up as (entry, exit)
+    order = np.lexsort((depth, index_ray))
+    index_ray, y = index_ray[order], y[order]
+    _, ray_start, ray_count = np.unique(index_ray, return_index=True, return_counts=True)
+    rank = np.arange(len(index_ray)) - np.repeat(ray_start, ray_count)
+    # rays with an odd hit count (open meshes) lose their unmatched last hit
+    paired = rank < np.repeat(ray_count - ray_count % 2, ray_count)
+    entry = np.flatnonzero(paired & (rank % 2 == 0))
+    y0 = np.clip(y[entry], 0, shape[1] - 1)
+    y1 = np.clip(y[entry + 1], 0, shape[1] - 1)
+    valid = y1 >= y0
+    # ray index == (x - x_start) * Z + z, offset to the global x * Z + z column key
+    return np.stack([index_ray[entry][valid] + x_start * shape[2], y0[valid], y1[valid] + 1])
+
+
+def voxelize_surface(mesh, resolution):
+    # the ray voxelizer rounds hits onto a global pitch lattice, so the grid's cell count is not simply
+    # extents / pitch (a unit box at pitch 1/127 comes out 127 x 127 x 129); step the pitch up until it fits
+    pitch = mesh.extents.max() / (resolution - 1)
+    # ray casting (Embree-accelerated when pyembree is installed) is much faster than subdivision
+    method = "ray"
+    for _ in range(MAX_PITCH_STEPS):
+        try:
+            vg = mesh.voxelized(pitch=pitch, method=method)
+        except ValueError:
+            # meshes thinner than one pitch along a ray grid axis leave the ray grid without hits
+            method = "subdivide"
+            vg = mesh.voxelized(pitch=pitch, method=method)
+        longest = int(max(vg.shape))
+        if longest <= resolution:
+            break
+        pitch *= (longest - 1) / (resolution - 1)
+    else:
+        raise ValueError(f"voxel grid {tuple(int(n) for n in vg.shape)} does not fit within resolution {resolution}")
+    return vg, pitch
+
+
+def fill_solid(mesh, vg):
+    """
+    Solid-fill a surface voxelization as per-column runs, without any per-cell arrays.
+
+    One ray is cast along +y (up) through every (x, z) column; cells between each
+    entry/exit hit pair are filled and merged with the surface cells of that column.
+    Returns [K, 4] uint16 spans (x, z, y_start, y_stop) in grid indices, so memory
+    scales with the number of runs (~ surface area), not the filled volume.
+    """
+    shape = np.asarray(vg.shape, dtype=np.int64)
+    surface = np.asarray(vg.sparse_indices).reshape(-1, 3)
+    # walk the surface a slab of x columns at a time, together with that slab's rays
+    order = np.argsort(surface[:, 0], kind="stable")
+
+    # bounds the ray tracer's temporaries and every per-slab array
+    step = max(1, RAY_BATCH // int(shape[2]))
+    slabs = np.arange(0, int(shape[0]) + step, step)
+    bounds = np.searchsorted(surface[order, 0], slabs)
+    spans = []
+    for x_start, lo, hi in zip(slabs[:-1], bounds[:-1], bounds[1:]):
+        cells = surface[order[lo:hi]].astype(np.int64)
+        # surface cells are length-1 runs
+        runs = np.stack([cells[:, 0] * shape[2] + cells[:, 2], cells[:, 1], cells[:, 1] + 1])
+        runs = np.concatenate([runs, _ray_runs(mesh, vg, x_start, min(x_start + step, int(shape[0])))], axis=1)
+        column, start, stop = _merge_spans(*runs)
+        x, z = np.divmod(column, shape[2])
+        spans.append(np.stack([x, z, start, stop], axis=-1).astype(np.uint16))
+    return np.concatenate(spans) if spans else np.zeros((0, 4), dtype=np.uint16)
+
+
+def binvox_to_spans(file_obj):
+    """
+    Read a binvox file straight into fill_solid's (x, z, y_start, y_stop) spans and its (X, Y, Z) grid shape.
+
+    binvox is already run-length encoded with y as the fastest axis (x, z, y order), so
+    its runs only need splitting at column ends; the dense grid is never decoded.
+    """
+    from trimesh.exchange.binvox import parse_binvox
+
+    binvox = parse_binvox(file_obj)
+    # dim is (x, y, z) and the voxels are stored x, z, y with y fastest: index = (x * Z + z) * Y + y
+    depth, width, height = (int(n) for n in binvox.shape)
+    values, counts = binvox.rle_data[0::2], binvox.rle_data[1::2].astype(np.int64)
+    ends = np.cumsum(counts)
+    # neighbouring (value, count) pairs only cap runs at 255; merge them into real runs first
+    change = np.flatnonzero(np.diff(values.astype(np.int8))) + 1
+    run_values = values[np.concatenate([[0], change])] if len(values) else values
+    run_ends = ends[np.concatenate([change - 1, [len(ends) - 1]])] if len(values) else ends
+    run_starts = np.concatenate([[0], run_ends[:-1]])
+    filled = run_values > 0
+    start, stop = run_starts[filled], run_ends[filled]
+
+    # cut runs that wrap from one column into the next
+    first = start // width
+    pieces = (stop - 1) // width - first + 1
+    column = np.repeat(first, pieces) + np.arange(int(pieces.sum())) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    y0 = np.maximum(np.repeat(start, pieces), column * width) - column * width
+    y1 = np.minimum(np.repeat(stop, pieces), (column + 1) * width) - column * width
+    x, z = np.divmod(column, height)
+    spans = np.stack([x, z, y0, y1], axis=-1).astype(np.uint16)
+    return spans, (depth, width, height)
+
+
+def spans_yup_to_zup(spans, shape):
+    """
+    Convert (x, z, y_start, y_stop) grid spans to (x, y, z_start, z_stop) MagicaVoxel spans.
+
+    trimesh/DreamGaussian meshes are Y-up, MagicaVoxel is Z-up: (x, y, z) -> (x, -z, y).
+    The up axis is the run axis on both sides, so runs stay runs.
+    """
+    spans = np.asarray(spans)
+    out = np.empty_like(spans)
+    out[:, 0] = spans[:, 0]
+    out[:, 1] = shape[2] - 1 - spans[:, 1].astype(np.int64)
+    out[:, 2:] = spans[:, 2:]
+    return out, (shape[0], shape[2], shape[1])
+
+
+def write_vox(path, indices, shape, color_index=1):
+    # indices: [M, 3] int voxel coordinates (MagicaVoxel axes), shape: grid size (X, Y, Z)
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    spans = np.concatenate([indices, indices[:, 2:] + 1], axis=-1)
+    return write_vox_spans(path, spans, shape, color_index=color_index)
+
+
+def write_vox_spans(path, spans, shape, color_index=1):
+    """
+    Write [K, 4] (x, y, z_start, z_stop) runs (MagicaVoxel axes) of a grid of size shape (X, Y, Z) to a .vox file.
+
+    Models are streamed to disk tile by tile, so only one batch of cells is ever expanded in memory.
+    """
+    spans = np.asarray(spans).reshape(-1, 4)
+    shape = np.asarray(shape, dtype=np.int64)
+    tiles = np.ceil(shape / MAX_MODEL_SIZE).astype(np.int64)
+
+    models = []  # (offset, size, local spans) per occupied tile
+    x, y = spans[:, 0].astype(np.int64), spans[:, 1].astype(np.int64)
+    z0, z1 = spans[:, 2].astype(np.int64), spans[:, 3].astype(np.int64)
+    column_key = (x // MAX_MODEL_SIZE) * tiles[1] + y // MAX_MODEL_SIZE
+    for tz in range(tiles[2]):
+        # cut runs at the z tile boundaries
+        lo = np.maximum(z0, tz * MAX_MODEL_SIZE)
+        hi = np.minimum(z1, (tz + 1) * MAX_MODEL_SIZE)
+        inside = np.flatnonzero(hi > lo)
+        if not len(inside):
+            continue
+        # group by (x, y) tile in one pass, so only occupied tiles are visited
+        order = inside[np.argsort(column_key[inside], kind="stable")]
+        keys, starts = np.unique(column_key[order], return_index=True)
+        for key, group in zip(keys, np.split(order, starts[1:])):
+            offset = np.array([key // tiles[1], key % tiles[1], tz]) * MAX_MODEL_SIZE
+            size = np.minimum(shape - offset, MAX_MODEL_SIZE)
+            local = np.stack([x[group], y[group], lo[group], hi[group]], axis=-1) - np.concatenate([offset, offset[2:]])
+            models.append((offset, size, local.astype(np.int64)))
+
+    if not models:
+        # MagicaVoxel refuses files without any model
+        models.append((np.zeros(3, dtype=np.int64), np.ones(3, dtype=np.int64), np.zeros((0, 4), dtype=np.int64)))
+
+    with open(path, "wb") as f:
+        f.write(b"VOX " + struct.pack("<i", VOX_VERSION))
+        # children size is patched in once everything is written
+        main_at = f.tell()
+        f.write(b"MAIN" + struct.pack("<ii", 0, 0))
+        for _, size, local in models:
+            _write_model(f, local, size, color_index)
+
+        if len(models) > 1:
+            # scene graph: root transform -> group -> (transform -> shape) per tile
+            f.write(_transform(0, 1, -1))
+            child_ids = [2 + 2 * i for i in range(len(models))]
+            f.write(_chunk(b"nGRP", struct.pack("<i", 1) + _dict({}) + struct.pack("<i", len(child_ids)) + struct.pack(f"<{len(child_ids)}i", *child_ids)))
+            for i, (node_id, (offset, size, _)) in enumerate(zip(child_ids, models)):
+                # MagicaVoxel places a model by its center
+                f.write(_transform(node_id, node_id + 1, 0, offset + size // 2 - shape // 2))
+                f.write(_chunk(b"nSHP", struct.pack("<i", node_id + 1) + _dict({}) + struct.pack("<i", 1) + struct.pack("<i", i) + _dict({})))
+
+        end = f.tell()
+        f.seek(main_at + 8)
+        f.write(struct.pack("<i", end - main_at - 12))
+    return path
+
+
+def mesh_to_vox(mesh, vox_path, resolution, adaptive=True):
+    vg, pitch = voxelize_surface(mesh, resolution)
+    # the ray grid only spans the mesh AABB, so thin/flat assets cost a thin grid instead of resolution^3
+    print(f"Voxel grid {tuple(int(n) for n in vg.shape)} (pitch {pitch:.5f})")
+    # solid interior as compact per-column runs; neither a dense grid nor per-cell arrays are built
+    spans = fill_solid(mesh, vg)
+    return write_solid_vox(vox_path, spans, vg.shape, resolution, adaptive=adaptive)
+
+
+def write_solid_vox(vox_path, spans, shape, resolution, adaptive=True):
+    # spans: (x, z, y_start, y_stop) runs of a tight Y-up grid of the given shape
+    spans, shape = spans_yup_to_zup(spans, shape)
+    if not adaptive:
+        # pad the tight grid out to a centered resolution^3 cube; never shrink it, so the offset can't go negative
+        cube = np.maximum(np.full(3, resolution), shape)
+        pad = (cube - np.asarray(shape)) // 2
+        spans = spans.astype(np.int64) + np.concatenate([pad, pad[2:]])
+        shape = cube
+    return write_vox_spans(vox_path, spans, shape)